@@ -1,29 +1,770 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 import torch
+import torchvision
 import cv2
 import numpy as np
 
+from .utils import letterbox, scale_boxes
+
+try:
+    import tensorrt as trt
+    TRT_AVAILABLE = True
+except ImportError:
+    TRT_AVAILABLE = False
+
+
+class Detection:
+    """Single-object detection record.
+
+    The pipeline itself moves Detections (struct-of-arrays) between
+    stages; this per-object view is for callers and tests that work with
+    one object at a time.
+    """
+
+    __slots__ = ('bbox', 'confidence', 'class_id', 'class_name', 'track_id',
+                 '_centroid')
+
+    def __init__(self, bbox, confidence, class_id, class_name=None):
+        """
+        Initialize a detection.
+
+        Args:
+            bbox: Bounding box [x1, y1, x2, y2]
+            confidence: Confidence score
+            class_id: Class ID
+            class_name: Optional class name (defaults to the class ID)
+        """
+        # Compact float32 storage instead of a Python list: one quarter the
+        # memory per box and NumPy-ready for bulk IoU/centroid arithmetic
+        self.bbox = np.asarray(bbox, dtype=np.float32)
+        self.confidence = confidence
+        self.class_id = class_id
+        self.class_name = class_name if class_name is not None else str(class_id)
+        self.track_id = None
+        self._centroid = None
+
+    @property
+    def centroid(self):
+        """Box center as (center_x, center_y), computed once and cached."""
+        if self._centroid is None:
+            self._centroid = ((self.bbox[0] + self.bbox[2]) / 2,
+                              (self.bbox[1] + self.bbox[3]) / 2)
+        return self._centroid
+
+    @staticmethod
+    def centroids_of(detections):
+        """
+        Compute centroids of many detections in one vectorized pass.
+
+        A single NumPy expression replaces per-object tuple arithmetic,
+        which matters when frames carry hundreds of detections.
+
+        Args:
+            detections: Sequence of Detection objects
+
+        Returns:
+            (N, 2) float32 array of (center_x, center_y) rows
+        """
+        boxes = np.asarray([d.bbox for d in detections], dtype=np.float32).reshape(-1, 4)
+        return (boxes[:, :2] + boxes[:, 2:]) * 0.5
+
+
+class Detections:
+    """Struct-of-arrays container for one frame's detections.
+
+    Boxes, confidences and classes live in parallel contiguous arrays, so
+    downstream consumers (tracker IoU, memory, drawing) work on whole
+    arrays instead of per-object Python dicts.
+    """
+
+    __slots__ = ('boxes', 'confidences', 'classes', 'track_ids')
+
+    def __init__(self, boxes, confidences, classes):
+        """
+        Initialize detections from parallel arrays.
+
+        Args:
+            boxes: (N, 4) array of [x1, y1, x2, y2]
+            confidences: (N,) array of confidence scores
+            classes: (N,) array of class IDs
+        """
+        self.boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        self.confidences = np.asarray(confidences, dtype=np.float32)
+        self.classes = np.asarray(classes, dtype=np.int32)
+        self.track_ids = np.full(len(self.boxes), -1, dtype=np.int32)  # Filled by the tracker
+
+    def __len__(self):
+        return len(self.boxes)
+
+    @classmethod
+    def empty(cls):
+        """Return an empty detections container."""
+        return cls(np.empty((0, 4), dtype=np.float32),
+                   np.empty(0, dtype=np.float32),
+                   np.empty(0, dtype=np.int32))
+
+
+class TensorRTBackend:
+    """Runs YOLO inference through a TensorRT engine with preallocated buffers."""
+
+    def __init__(self, engine_path, device):
+        """
+        Initialize TensorRT backend from a serialized engine.
+
+        Args:
+            engine_path: Path to serialized TensorRT engine
+            device: CUDA device string (e.g. 'cuda:0')
+        """
+        self.device = device
+        logger = trt.Logger(trt.Logger.WARNING)
+        with open(engine_path, 'rb') as f:
+            runtime = trt.Runtime(logger)
+            self.engine = runtime.deserialize_cuda_engine(f.read())
+        self.context = self.engine.create_execution_context()
+
+        # Allocate double-buffered input/output pairs once; torch manages the
+        # CUDA memory so the engine shares the same context as the rest of the
+        # pipeline. Two slots let the H2D copy of frame N+1 overlap with
+        # inference of frame N on separate streams.
+        # TensorRT 10 removed the binding-index APIs; resolve I/O tensors
+        # by name where available and fall back to the 8.x calls
+        if hasattr(self.engine, 'get_tensor_name'):
+            names = [self.engine.get_tensor_name(i)
+                     for i in range(self.engine.num_io_tensors)]
+            self.input_name = next(n for n in names if self.engine.get_tensor_mode(n)
+                                   == trt.TensorIOMode.INPUT)
+            self.output_name = next(n for n in names if self.engine.get_tensor_mode(n)
+                                    == trt.TensorIOMode.OUTPUT)
+            self.input_shape = tuple(self.engine.get_tensor_shape(self.input_name))
+            self.output_shape = tuple(self.engine.get_tensor_shape(self.output_name))
+        else:
+            self.input_name = self.output_name = None
+            self.input_shape = tuple(self.engine.get_binding_shape(0))
+            self.output_shape = tuple(self.engine.get_binding_shape(1))
+        self.host_buffers = [torch.empty(self.input_shape, dtype=torch.float32, pin_memory=True)
+                             for _ in range(2)]
+        self.input_buffers = [torch.empty(self.input_shape, dtype=torch.float32, device=device)
+                              for _ in range(2)]
+        self.output_buffers = [torch.empty(self.output_shape, dtype=torch.float32, device=device)
+                               for _ in range(2)]
+        self.copy_stream = torch.cuda.Stream(device=device)
+        self.compute_stream = torch.cuda.Stream(device=device)
+        self.copy_events = [torch.cuda.Event(), torch.cuda.Event()]
+
+    def _issue_copy(self, input_tensor, slot):
+        """Stage an input tensor through pinned memory and start its async upload."""
+        self.host_buffers[slot].copy_(input_tensor)
+        with torch.cuda.stream(self.copy_stream):
+            self.input_buffers[slot].copy_(self.host_buffers[slot], non_blocking=True)
+            self.copy_events[slot].record(self.copy_stream)
+
+    def infer(self, input_tensor):
+        """
+        Run inference on a single preprocessed (1, 3, H, W) tensor.
+
+        Args:
+            input_tensor: Input tensor (CPU, preprocessed)
+
+        Returns:
+            Raw prediction tensor of shape (1, num_candidates, 5 + num_classes)
+        """
+        return self.infer_batch([input_tensor])[0]
+
+    def infer_batch(self, input_tensors):
+        """
+        Run inference over a sequence of inputs, overlapping each upload
+        with the previous frame's execution.
+
+        Args:
+            input_tensors: List of preprocessed (1, 3, H, W) CPU tensors
+
+        Returns:
+            List of raw prediction tensors, one per input
+        """
+        outputs = []
+        self._issue_copy(input_tensors[0], 0)
+
+        for i in range(len(input_tensors)):
+            slot = i % 2
+            self.compute_stream.wait_event(self.copy_events[slot])
+            with torch.cuda.stream(self.compute_stream):
+                if self.input_name is not None:
+                    self.context.set_tensor_address(
+                        self.input_name, self.input_buffers[slot].data_ptr())
+                    self.context.set_tensor_address(
+                        self.output_name, self.output_buffers[slot].data_ptr())
+                    self.context.execute_async_v3(self.compute_stream.cuda_stream)
+                else:
+                    bindings = [int(self.input_buffers[slot].data_ptr()),
+                                int(self.output_buffers[slot].data_ptr())]
+                    self.context.execute_async_v2(bindings, self.compute_stream.cuda_stream)
+            done = self.compute_stream.record_event()
+
+            # Start uploading the next frame while this one executes
+            if i + 1 < len(input_tensors):
+                self._issue_copy(input_tensors[i + 1], (i + 1) % 2)
+
+            done.synchronize()
+            outputs.append(self.output_buffers[slot].clone())
+        return outputs
+
+
+def build_engine(onnx_path, engine_path, half=True):
+    """
+    Build and serialize a TensorRT engine from an ONNX model.
+
+    Args:
+        onnx_path: Path to ONNX model
+        engine_path: Path where the serialized engine is written
+        half: Enable FP16 kernels when the platform supports them
+    """
+    logger = trt.Logger(trt.Logger.WARNING)
+    builder = trt.Builder(logger)
+    network = builder.create_network(1 << int(trt.NetworkDefinitionCreationFlag.EXPLICIT_BATCH))
+    parser = trt.OnnxParser(network, logger)
+
+    with open(onnx_path, 'rb') as f:
+        if not parser.parse(f.read()):
+            errors = [str(parser.get_error(i)) for i in range(parser.num_errors)]
+            raise RuntimeError(f"Failed to parse ONNX model: {errors}")
+
+    config = builder.create_builder_config()
+    # 1 GB workspace; the memory-pool API replaced max_workspace_size in
+    # TensorRT 10
+    if hasattr(config, 'set_memory_pool_limit'):
+        config.set_memory_pool_limit(trt.MemoryPoolType.WORKSPACE, 1 << 30)
+    else:
+        config.max_workspace_size = 1 << 30
+    if half and builder.platform_has_fast_fp16:
+        config.set_flag(trt.BuilderFlag.FP16)
+
+    serialized_engine = builder.build_serialized_network(network, config)
+    if serialized_engine is None:
+        raise RuntimeError("Failed to build TensorRT engine")
+
+    with open(engine_path, 'wb') as f:
+        f.write(serialized_engine)
+
+
+class ONNXBackend:
+    """Runs YOLO inference through ONNX Runtime's oneDNN CPU kernels."""
+
+    def __init__(self, onnx_path, num_threads=None):
+        """
+        Initialize ONNX Runtime backend.
+
+        Args:
+            onnx_path: Path to ONNX model
+            num_threads: Intra-op thread count (defaults to all cores)
+        """
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads or os.cpu_count()
+        self.session = ort.InferenceSession(onnx_path, sess_options=options,
+                                            providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def infer(self, input_tensor):
+        """Run inference on a single preprocessed (1, 3, H, W) tensor."""
+        return self.infer_batch([input_tensor])[0]
+
+    def infer_batch(self, input_tensors):
+        """Run inference over a sequence of preprocessed CPU tensors."""
+        outputs = []
+        for tensor in input_tensors:
+            prediction = self.session.run(None, {self.input_name: tensor.numpy()})[0]
+            outputs.append(torch.from_numpy(prediction))
+        return outputs
+
+
+class OpenVINOBackend:
+    """Runs YOLO inference through an OpenVINO-compiled CPU graph."""
+
+    def __init__(self, model_path):
+        """
+        Initialize OpenVINO backend.
+
+        Args:
+            model_path: Path to OpenVINO IR (.xml) or ONNX model
+        """
+        from openvino.runtime import Core
+
+        self.compiled_model = Core().compile_model(model_path, 'CPU')
+        self.output = self.compiled_model.outputs[0]
+
+    def infer(self, input_tensor):
+        """Run inference on a single preprocessed (1, 3, H, W) tensor."""
+        return self.infer_batch([input_tensor])[0]
+
+    def infer_batch(self, input_tensors):
+        """Run inference over a sequence of preprocessed CPU tensors."""
+        return [torch.from_numpy(self.compiled_model([tensor.numpy()])[self.output])
+                for tensor in input_tensors]
+
+
+class _TracedModule(torch.nn.Module):
+    """Adapts a single-input traced graph to the hub wrapper's call style.
+
+    The wrapper invokes its core network with extra arguments (augment,
+    profile - the set varies by yolov5 release) that a traced graph
+    rejects; they only select eager-mode code paths, so they are accepted
+    and dropped here. Attribute lookups fall through to the traced module
+    so metadata like stride and names stays reachable.
+    """
+
+    def __init__(self, traced):
+        super().__init__()
+        self.traced = traced
+
+    def forward(self, x, *args, **kwargs):
+        return self.traced(x)
+
+    def __getattr__(self, name):
+        try:
+            return super().__getattr__(name)
+        except AttributeError:
+            return getattr(super().__getattr__('traced'), name)
+
+
 class YOLODetector:
-    def __init__(self, model_name, conf_threshold, iou_threshold, device, classes=None):
+    def __init__(self, model_name, conf_threshold, iou_threshold, device, classes=None, imgsz=640,
+                 jit=False, quantize=False):
         self.device = device
-        self.model = torch.hub.load('ultralytics/yolov5', 'custom', path=model_name, force_reload=True).to(device)
+        # Rely on the hub cache rather than re-downloading the repo every
+        # start; when the clone is already cached, load it as a local repo
+        # so warm starts skip the GitHub round-trip entirely
+        hub_repo = os.path.join(torch.hub.get_dir(), 'ultralytics_yolov5_master')
+        if os.path.isdir(hub_repo):
+            self.model = torch.hub.load(hub_repo, 'custom', path=model_name,
+                                        source='local', trust_repo=True).to(device)
+        else:
+            self.model = torch.hub.load('ultralytics/yolov5', 'custom', path=model_name,
+                                        force_reload=False, trust_repo=True).to(device)
         self.conf_threshold = conf_threshold
         self.iou_threshold = iou_threshold
         self.classes = classes
+        self.imgsz = imgsz
+
+        # Reusable staging tensors for engine preprocessing, one per batch
+        # position, allocated lazily; pinned on CUDA for async H2D copies
+        self._input_buffers = []
+
+        # Fold BatchNorm into conv weights up front: one fewer read and
+        # write of every activation tensor per block. Hub checkpoints
+        # usually arrive fused already, in which case this is a no-op
+        inner = self.model.model if hasattr(self.model, 'model') else self.model
+        if hasattr(inner, 'fuse'):
+            try:
+                inner.fuse()
+            except Exception as e:
+                print(f"Conv+BN fuse unavailable ({e})")
+
+        # PyTorch-path startup optimizations: NHWC (channels_last) conv
+        # weights on every device - oneDNN on CPU and cuDNN/Tensor Cores
+        # on CUDA both prefer it over strided NCHW - plus FP16 weights on
+        # CUDA and torch.compile when this torch has it
+        self.model = self.model.to(memory_format=torch.channels_last)
+        if str(device).startswith('cuda'):
+            self.model = self.model.half()
+
+        # Autocast only where FP16 actually wins: Volta (sm_70) and newer
+        # have Tensor Cores, on Pascal FP16 is slower than FP32
+        self.use_autocast = (str(device).startswith('cuda')
+                             and torch.cuda.get_device_capability(device)[0] >= 7)
+        # INT8 quantization is resolved in the CPU backend: the network is
+        # fully convolutional (no nn.Linear), so torch's dynamic
+        # quantization would be a silent no-op here. The ONNX export is
+        # quantized instead, where conv weights genuinely shrink to int8
+        self.quantize = quantize and device == 'cpu'
+
+        eager_model = self.model
+        if jit:
+            # TorchScript trace fuses kernels ahead of time and removes
+            # per-op Python dispatch, the dominant cost of small-batch CPU
+            # inference; torch.compile is skipped since the traced graph
+            # already covers the same overhead
+            self._trace_model()
+        elif hasattr(torch, 'compile'):
+            try:
+                self.model = torch.compile(self.model, mode='reduce-overhead', fullgraph=False)
+            except Exception as e:
+                print(f"torch.compile unavailable ({e}), using eager model")
+
+        # Warm up once so compilation/autotuning happens before the first
+        # real frame instead of during it. torch.compile is lazy and only
+        # actually compiles here, so a dynamo failure on the hub wrapper
+        # surfaces now; drop back to the eager module rather than keeping
+        # a model that raises on every detect()
+        dummy_frame = np.zeros((self.imgsz, self.imgsz, 3), dtype=np.uint8)
+        try:
+            with torch.inference_mode():
+                self.model(dummy_frame, size=self.imgsz)
+        except Exception as e:
+            if self.model is not eager_model:
+                print(f"Compiled model failed on warm-up ({e}), using eager model")
+                self.model = eager_model
+                try:
+                    with torch.inference_mode():
+                        self.model(dummy_frame, size=self.imgsz)
+                except Exception:
+                    pass
+
+        # Prefer a TensorRT engine on CUDA devices: FP16 Tensor Cores and fused
+        # kernels give a multi-x speedup over eager FP32 inference. On CPU,
+        # OpenVINO/ONNX Runtime graph-fused kernels beat eager PyTorch convs.
+        self.backend = None
+        if TRT_AVAILABLE and str(device).startswith('cuda'):
+            try:
+                engine_path = self._get_engine(model_name)
+                self.backend = TensorRTBackend(engine_path, device)
+                print(f"Using TensorRT engine: {engine_path}")
+            except Exception as e:
+                print(f"TensorRT unavailable ({e}), falling back to PyTorch inference")
+        elif device == 'cpu':
+            self.backend = self._load_cpu_backend(model_name)
+
+        # Without an engine, a CUDA Graph replay of the fixed-shape core
+        # forward removes per-call kernel-launch overhead, which dominates
+        # single-frame latency on fast GPUs
+        self.cuda_graph = None
+        if self.backend is None and str(device).startswith('cuda'):
+            self._init_cuda_graph()
+
+    def _trace_model(self):
+        """Swap the model's core network for a traced TorchScript graph.
+
+        Only the inner network is traced; the hub wrapper stays in place
+        so letterboxing and NMS behave exactly as in eager mode.
+        """
+        try:
+            inner = self.model.model if hasattr(self.model, 'model') else self.model
+            dummy = torch.zeros(1, 3, self.imgsz, self.imgsz, device=self.device)
+            if str(self.device).startswith('cuda'):
+                dummy = dummy.to(memory_format=torch.channels_last).half()
+            traced = torch.jit.trace(inner, dummy, strict=False).eval()
+            try:
+                traced = torch.jit.optimize_for_inference(traced)
+            except Exception:
+                pass
+            if hasattr(self.model, 'model'):
+                # The hub wrapper calls its core with extra positional or
+                # keyword arguments (augment/profile, varying by yolov5
+                # release) that a traced graph rejects; shim them away
+                self.model.model = _TracedModule(traced)
+            else:
+                self.model = traced
+            print("Using TorchScript-traced model")
+        except Exception as e:
+            print(f"TorchScript trace failed ({e}), using eager model")
+
+    def _load_cpu_backend(self, model_name):
+        """Load an OpenVINO or ONNX Runtime backend when an export exists."""
+        stem = os.path.splitext(model_name)[0]
+
+        # OpenVINO IR exported via `yolov5 export --include openvino`
+        xml_path = os.path.join(f"{stem}_openvino_model", f"{os.path.basename(stem)}.xml")
+        if os.path.isfile(xml_path):
+            try:
+                backend = OpenVINOBackend(xml_path)
+                print(f"Using OpenVINO model: {xml_path}")
+                return backend
+            except Exception as e:
+                print(f"OpenVINO unavailable ({e})")
+
+        # Export on demand when nothing is on disk yet; the file is cached
+        # next to the weights so later runs skip the export entirely.
+        # Probe the import first: without onnxruntime the multi-second
+        # export would be wasted on every cold start
+        onnx_path = f"{stem}.onnx"
+        try:
+            import onnxruntime  # noqa: F401
+            if not os.path.isfile(onnx_path):
+                self._export_onnx(onnx_path)
+            if self.quantize:
+                onnx_path = self._quantize_onnx(onnx_path, stem)
+            backend = ONNXBackend(onnx_path)
+            print(f"Using ONNX Runtime model: {onnx_path}")
+            return backend
+        except Exception as e:
+            print(f"ONNX Runtime unavailable ({e})")
+
+        return None
+
+    def _quantize_onnx(self, onnx_path, stem):
+        """Produce (and cache) an INT8-quantized copy of an ONNX export.
+
+        Weights shrink to a quarter of their FP32 size, so convs move far
+        fewer bytes and can hit integer dot-product kernels on hardware
+        that has them.
+        """
+        quant_path = f"{stem}.int8.onnx"
+        try:
+            if not os.path.isfile(quant_path):
+                from onnxruntime.quantization import quantize_dynamic, QuantType
+                quantize_dynamic(onnx_path, quant_path, weight_type=QuantType.QInt8)
+            print(f"Using INT8-quantized model: {quant_path}")
+            return quant_path
+        except Exception as e:
+            print(f"INT8 quantization unavailable ({e}), using FP32 ONNX model")
+            return onnx_path
+
+    def _export_onnx(self, onnx_path):
+        """Export the underlying detection model to ONNX at the given path."""
+        inner_model = self.model.model if hasattr(self.model, 'model') else self.model
+        # Match the model's dtype: on CUDA the weights are already FP16,
+        # and a float32 dummy would fail the export with a dtype mismatch
+        dummy = torch.zeros(1, 3, self.imgsz, self.imgsz, device=self.device,
+                            dtype=next(inner_model.parameters()).dtype)
+        torch.onnx.export(inner_model, dummy, onnx_path, opset_version=12,
+                          input_names=['images'], output_names=['output'])
+
+    def _get_engine(self, model_name):
+        """Return path to a TensorRT engine for the model, building it if needed."""
+        stem = os.path.splitext(model_name)[0]
+        engine_path = f"{stem}.engine"
+        if os.path.isfile(engine_path):
+            return engine_path
+
+        # Export ONNX from the underlying detection model, then build the engine
+        onnx_path = f"{stem}.onnx"
+        if not os.path.isfile(onnx_path):
+            self._export_onnx(onnx_path)
+        build_engine(onnx_path, engine_path, half=True)
+        return engine_path
 
     def detect(self, frame):
-        # Convert frame to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Perform inference
-        results = self.model(rgb_frame)
-        
-        # Filter results based on confidence and classes
-        detections = []
-        for *box, conf, cls in results.xyxy[0].cpu().numpy():
-            if conf >= self.conf_threshold and (self.classes is None or int(cls) in self.classes):
-                detections.append({
-                    'box': box,  # [x1, y1, x2, y2]
-                    'confidence': conf,
-                    'class': int(cls)
-                })
-        return detections
+        """
+        Run detection on a single frame.
+
+        Args:
+            frame: BGR frame (np.ndarray or cv2.UMat)
+
+        Returns:
+            Detections container for the frame
+        """
+        # Accept OpenCL-backed UMat frames (OpenCV T-API): any GPU-side
+        # preprocessing has already run, so download to host once here
+        if isinstance(frame, cv2.UMat):
+            frame = frame.get()
+
+        # Provably empty frames (camera warm-up, blanked feeds) skip the
+        # forward pass entirely; not frame.any() is a SIMD scan that costs
+        # microseconds against the ~10ms a conv pass would burn
+        if frame.dtype == np.uint8 and not frame.any():
+            return Detections.empty()
+        if self.cuda_graph is not None:
+            return self._detect_graph(frame)
+        return self.detect_batch([frame])[0]
+
+    def detect_batch(self, frames):
+        """
+        Run detection on a list of frames with a single forward pass.
+
+        Batching amortizes kernel launch and Python overhead across frames,
+        so GPU throughput scales much better than per-frame calls.
+
+        Args:
+            frames: List of BGR frames
+
+        Returns:
+            List of per-frame Detections containers, in input order
+        """
+        if self.backend is not None:
+            # The TensorRT engine is built for batch 1; pipeline frames so
+            # each upload overlaps the previous frame's execution
+            return self._detect_engine_batch(frames)
+
+        # BGR->RGB as a zero-copy reversed-channel view; the model's own
+        # preprocessing folds the swap into the resize/contiguous pass it
+        # already performs, so no separate CPU conversion buffer is written
+        rgb_frames = [frame[..., ::-1] for frame in frames]
+
+        # Perform inference on the whole batch at once; inference_mode is
+        # cheaper than no_grad (no autograd version counters or view
+        # tracking) and autocast runs convs/matmuls on FP16 Tensor Cores
+        with torch.inference_mode(), torch.cuda.amp.autocast(enabled=self.use_autocast):
+            results = self.model(rgb_frames, size=self.imgsz)
+
+        # Filter results based on confidence and classes, per frame
+        return [self._filter_results(xyxy.cpu().numpy()) for xyxy in results.xyxy]
+
+    def detect_stream(self, frames_iter, workers=4):
+        """
+        Run detection over an iterable of frames, overlapping CPU
+        preprocessing with inference.
+
+        The contiguous RGB conversion for upcoming frames runs in a thread
+        pool while the calling thread keeps the model busy, so per-frame
+        CPU work hides behind the previous frame's forward pass. A bounded
+        window of in-flight jobs keeps memory flat on long streams.
+
+        Args:
+            frames_iter: Iterable of BGR frames
+            workers: Number of preprocessing threads
+
+        Yields:
+            Per-frame Detections containers, in input order
+        """
+        if self.backend is not None:
+            # Engine preprocessing writes into per-slot staging buffers
+            # and is not safe to run from multiple threads; stay serial
+            for frame in frames_iter:
+                yield self._detect_engine(frame)
+            return
+
+        pending = deque()
+        max_inflight = 2 * workers
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for frame in frames_iter:
+                # The contiguous RGB copy is the CPU-side work the model
+                # would otherwise perform serially before each forward
+                pending.append(executor.submit(
+                    np.ascontiguousarray, frame[..., ::-1]))
+                if len(pending) >= max_inflight:
+                    yield self._forward_rgb(pending.popleft().result())
+            while pending:
+                yield self._forward_rgb(pending.popleft().result())
+
+    def _forward_rgb(self, rgb_frame):
+        """Run the model on one preprocessed RGB frame and filter results."""
+        with torch.inference_mode(), torch.cuda.amp.autocast(enabled=self.use_autocast):
+            results = self.model([rgb_frame], size=self.imgsz)
+        return self._filter_results(results.xyxy[0].cpu().numpy())
+
+    def _filter_results(self, results_array):
+        """Filter raw (N, 6) [x1, y1, x2, y2, conf, cls] rows into Detections."""
+        results_array = np.asarray(results_array, dtype=np.float32)
+        if results_array.size == 0:
+            return Detections.empty()
+
+        # Vectorized confidence/class mask instead of per-row Python checks
+        classes = results_array[:, 5].astype(np.int32)
+        mask = results_array[:, 4] >= self.conf_threshold
+        if self.classes is not None:
+            mask &= np.isin(classes, self.classes)
+
+        return Detections(results_array[mask, :4], results_array[mask, 4], classes[mask])
+
+    def _detect_engine(self, frame):
+        """Run detection on a single frame through the TensorRT engine."""
+        return self._detect_engine_batch([frame])[0]
+
+    def _detect_engine_batch(self, frames):
+        """Run detection on a list of frames through the TensorRT engine."""
+        preprocessed = [self._preprocess_engine(frame, slot)
+                        for slot, frame in enumerate(frames)]
+        predictions = self.backend.infer_batch([tensor for tensor, _, _ in preprocessed])
+        return [self._decode_engine(pred[0], ratio, pad, frame)
+                for pred, (_, ratio, pad), frame in zip(predictions, preprocessed, frames)]
+
+    def _init_cuda_graph(self):
+        """Capture the core network's forward pass as a replayable CUDA Graph.
+
+        The graph records the whole kernel sequence once against static
+        input/output tensors; detect() then refills the input and replays,
+        launching hundreds of kernels with a single call.
+        """
+        try:
+            inner = self.model.model if hasattr(self.model, 'model') else self.model
+            dtype = next(inner.parameters()).dtype
+            self._graph_input = torch.zeros(1, 3, self.imgsz, self.imgsz,
+                                            device=self.device, dtype=dtype)
+
+            # Warm up on a side stream so capture sees steady-state
+            # allocator behavior rather than first-call allocations
+            stream = torch.cuda.Stream(self.device)
+            stream.wait_stream(torch.cuda.current_stream(self.device))
+            with torch.cuda.stream(stream), torch.inference_mode():
+                for _ in range(3):
+                    inner(self._graph_input)
+            torch.cuda.current_stream(self.device).wait_stream(stream)
+
+            graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(graph), torch.inference_mode():
+                self._graph_output = inner(self._graph_input)
+            self.cuda_graph = graph
+            print("Using CUDA Graph replay for fixed-shape inference")
+        except Exception as e:
+            self.cuda_graph = None
+            print(f"CUDA Graph capture unavailable ({e}), using standard launches")
+
+    def _detect_graph(self, frame):
+        """Run detection on a single frame via CUDA Graph replay."""
+        tensor, ratio, pad = self._preprocess_engine(frame)
+        self._graph_input.copy_(tensor, non_blocking=True)
+        self.cuda_graph.replay()
+        output = self._graph_output
+        if isinstance(output, (list, tuple)):
+            output = output[0]
+        return self._decode_engine(output[0], ratio, pad, frame)
+
+    def _staging_buffer(self, slot):
+        """Return the reusable staging tensor for a batch position."""
+        pinned = str(self.device).startswith('cuda') and torch.cuda.is_available()
+        while len(self._input_buffers) <= slot:
+            self._input_buffers.append(torch.empty(
+                (1, 3, self.imgsz, self.imgsz), dtype=torch.float32, pin_memory=pinned))
+        return self._input_buffers[slot]
+
+    def _preprocess_engine(self, frame, slot=0):
+        """Letterbox to engine input size, BGR->RGB, HWC->CHW, scale to 0-1.
+
+        Writes into a persistent staging tensor instead of allocating a new
+        float tensor per call; copy_ folds the uint8->float32 conversion in.
+        """
+        padded, ratio, pad = letterbox(frame, self.imgsz)
+        tensor = self._staging_buffer(slot)
+        tensor[0].copy_(torch.from_numpy(np.ascontiguousarray(padded[..., ::-1].transpose(2, 0, 1))))
+        tensor.div_(255.0)
+        return tensor, ratio, pad
+
+    def _decode_engine(self, predictions, ratio, pad, frame):
+        """Decode raw engine output for one frame into Detections."""
+        boxes, confidences, class_ids = self._postprocess(predictions)
+
+        # Map boxes from letterboxed space back to frame coordinates
+        boxes = scale_boxes(boxes, ratio, pad, frame.shape)
+
+        if self.classes is not None:
+            keep = np.isin(class_ids.astype(np.int32), self.classes)
+            boxes, confidences, class_ids = boxes[keep], confidences[keep], class_ids[keep]
+
+        return Detections(boxes, confidences, class_ids)
+
+    def _postprocess(self, predictions):
+        """
+        Decode raw YOLO predictions: confidence filter, xywh->xyxy, NMS.
+
+        Args:
+            predictions: (num_candidates, 5 + num_classes) tensor
+
+        Returns:
+            Tuple of (boxes, confidences, class_ids) as numpy arrays
+        """
+        # Objectness filter
+        predictions = predictions[predictions[:, 4] >= self.conf_threshold]
+        if predictions.shape[0] == 0:
+            return np.empty((0, 4)), np.empty(0), np.empty(0, dtype=np.int64)
+
+        # Class confidence = objectness * class score
+        class_scores, class_ids = (predictions[:, 5:] * predictions[:, 4:5]).max(1)
+        keep = class_scores >= self.conf_threshold
+        predictions, class_scores, class_ids = predictions[keep], class_scores[keep], class_ids[keep]
+
+        # xywh -> xyxy
+        boxes = torch.empty_like(predictions[:, :4])
+        boxes[:, 0] = predictions[:, 0] - predictions[:, 2] / 2
+        boxes[:, 1] = predictions[:, 1] - predictions[:, 3] / 2
+        boxes[:, 2] = predictions[:, 0] + predictions[:, 2] / 2
+        boxes[:, 3] = predictions[:, 1] + predictions[:, 3] / 2
+
+        # Per-class NMS on the prediction's own device; only the kept rows
+        # ever cross to the host
+        keep = torchvision.ops.batched_nms(boxes, class_scores, class_ids, self.iou_threshold)
+        return (boxes[keep].cpu().numpy(),
+                class_scores[keep].cpu().numpy(),
+                class_ids[keep].cpu().numpy())
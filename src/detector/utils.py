@@ -1 +1,50 @@
- 
+import cv2
+import numpy as np
+
+
+def letterbox(frame, new_size=640, color=(114, 114, 114)):
+    """
+    Resize frame to a square new_size x new_size canvas keeping aspect ratio.
+
+    Args:
+        frame: Input BGR frame (HxWx3)
+        new_size: Target side length
+        color: Padding color
+
+    Returns:
+        Tuple of (padded image, scale ratio, (pad_x, pad_y))
+    """
+    height, width = frame.shape[:2]
+    ratio = min(new_size / height, new_size / width)
+    resized_w, resized_h = int(round(width * ratio)), int(round(height * ratio))
+
+    if (resized_w, resized_h) != (width, height):
+        frame = cv2.resize(frame, (resized_w, resized_h), interpolation=cv2.INTER_LINEAR)
+
+    pad_x = (new_size - resized_w) / 2
+    pad_y = (new_size - resized_h) / 2
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    frame = cv2.copyMakeBorder(frame, top, bottom, left, right,
+                               cv2.BORDER_CONSTANT, value=color)
+    return frame, ratio, (left, top)
+
+
+def scale_boxes(boxes, ratio, pad, frame_shape):
+    """
+    Map boxes from letterboxed coordinates back to original frame coordinates.
+
+    Args:
+        boxes: (N, 4) array of [x1, y1, x2, y2] in letterboxed space
+        ratio: Scale ratio returned by letterbox
+        pad: (pad_x, pad_y) returned by letterbox
+        frame_shape: Original frame shape (height, width, ...)
+
+    Returns:
+        (N, 4) array of boxes in original frame coordinates
+    """
+    boxes[:, [0, 2]] = (boxes[:, [0, 2]] - pad[0]) / ratio
+    boxes[:, [1, 3]] = (boxes[:, [1, 3]] - pad[1]) / ratio
+    boxes[:, [0, 2]] = np.clip(boxes[:, [0, 2]], 0, frame_shape[1])
+    boxes[:, [1, 3]] = np.clip(boxes[:, [1, 3]], 0, frame_shape[0])
+    return boxes
@@ -3,13 +3,15 @@ import time
 import cv2
 import torch
 import os
+import queue
+import threading
 from pathlib import Path
 
 from detector.detection_model import YOLODetector
 from tracker.object_tracker import SimpleTracker
 from memory.object_memory import ObjectMemory
 from project_utils.visualization import Visualizer
-from project_utils.video_utils import VideoWriter
+from project_utils.video_utils import FramePool, VideoWriter
 
 
 def parse_args():
@@ -21,7 +23,14 @@ def parse_args():
     parser.add_argument('--iou-thres', type=float, default=0.45, help='IoU threshold for NMS')
     parser.add_argument('--device', type=str, default='', help='Device to run inference on (cuda device or cpu)')
     parser.add_argument('--memory-frames', type=int, default=30, help='Number of frames to keep in memory')
+    parser.add_argument('--batch-size', type=int, default=4, help='Number of frames per detection batch')
+    parser.add_argument('--detect-stride', type=int, default=1,
+                        help='Run detection every K-th frame, tracker prediction in between')
+    parser.add_argument('--hub-dir', type=str, default='',
+                        help='Directory for the torch.hub cache (persists model downloads)')
     parser.add_argument('--show', action='store_true', help='Show the output in a window')
+    parser.add_argument('--no-viz', action='store_true',
+                        help='Skip drawing overlays entirely (benchmark/headless mode)')
     parser.add_argument('--classes', nargs='+', type=int, help='Filter by class')
     return parser.parse_args()
 
@@ -33,6 +42,11 @@ def main():
     device = args.device if args.device else ('cuda:0' if torch.cuda.is_available() else 'cpu')
     print(f"Using device: {device}")
 
+    # Point torch.hub at a persistent cache dir so model downloads survive
+    # across runs/containers
+    if args.hub_dir:
+        torch.hub.set_dir(args.hub_dir)
+
     # Initialize detector, tracker, memory, and visualizer
     detector = YOLODetector(model_name=args.model, 
                            conf_threshold=args.conf_thres, 
@@ -72,63 +86,169 @@ def main():
             (width, height)
         )
     
+    # Recycled capture buffers; pinned host memory on CUDA for fast uploads
+    frame_pool = FramePool(width, height, size=args.batch_size + 2,
+                           pinned=device.startswith('cuda'))
+
     # Performance metrics
     frame_count = 0
     start_time = time.time()
     processing_times = []
     
     print("Starting video processing...")
-    
+
+    # Three-stage pipeline: (capture) -> (GPU inference) -> (track/draw/
+    # write). Capture and post-processing run in their own threads so CPU
+    # work overlaps with the next batch's inference on the GPU.
+    capture_queue = queue.Queue(maxsize=4)
+    result_queue = queue.Queue(maxsize=4)
+    # GUI calls are only safe on the main thread (Cocoa, some GTK builds),
+    # so the post-processing thread hands display frames back over a queue
+    display_queue = queue.Queue(maxsize=2) if args.show else None
+    stop_event = threading.Event()
+
+    def capture_stage():
+        """Stage 1: read frames into pool buffers and batch them."""
+        pending_frames = []
+        while not stop_event.is_set():
+            buffer = frame_pool.acquire()
+            ret, frame = cap.read(buffer)
+            if ret:
+                pending_frames.append(frame)
+                if len(pending_frames) < args.batch_size:
+                    continue
+            else:
+                frame_pool.release(buffer)
+            if pending_frames:
+                capture_queue.put(pending_frames)
+                pending_frames = []
+            if not ret:
+                break
+        capture_queue.put(None)
+
+    def postprocess_stage():
+        """Stage 3: track, update memory, draw, display and write frames."""
+        nonlocal frame_count
+        while True:
+            item = result_queue.get()
+            if item is None:
+                break
+            frames, batch_detections, detect_time_per_frame = item
+
+            for frame, detections in zip(frames, batch_detections):
+                frame_start_time = time.time()
+
+                # Update tracker; on skipped frames propagate tracks with
+                # the constant-velocity predictor instead
+                if detections is None:
+                    tracks = tracker.predict()
+                else:
+                    tracks = tracker.update(detections)
+
+                # Update memory
+                missing_objects, new_objects = object_memory.update(tracks)
+
+                # Visualize results (drawn in place; the raw frame is not
+                # needed again after this point). Drawing is skipped when
+                # nothing displays or records the overlays.
+                draw = not args.no_viz and (args.show or video_writer is not None)
+                if draw:
+                    output_frame = visualizer.draw_results(
+                        frame,
+                        tracks,
+                        missing_objects,
+                        new_objects
+                    )
+                else:
+                    output_frame = frame
+
+                # Calculate processing time for this frame
+                frame_time = detect_time_per_frame + (time.time() - frame_start_time)
+                processing_times.append(frame_time)
+
+                # Display FPS on frame
+                if draw:
+                    current_fps = 1.0 / frame_time if frame_time > 0 else 0
+                    cv2.putText(output_frame, f"FPS: {current_fps:.2f}", (10, 30),
+                                cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+
+                # Hand a copy to the main thread for display; drop the
+                # frame rather than stall the pipeline when it is busy
+                if display_queue is not None:
+                    try:
+                        display_queue.put_nowait(output_frame.copy())
+                    except queue.Full:
+                        pass
+
+                # Write to video; write() copies into the writer's own slot
+                # ring, so the capture buffer is free to recycle right away
+                if video_writer:
+                    video_writer.write(output_frame)
+                frame_pool.release(output_frame)
+
+                frame_count += 1
+
+    capture_thread = threading.Thread(target=capture_stage, daemon=True)
+    postprocess_thread = threading.Thread(target=postprocess_stage, daemon=True)
+    capture_thread.start()
+    postprocess_thread.start()
+
     try:
+        # Stage 2: this thread owns the model and runs inference, so the
+        # GPU stays busy while the other stages handle I/O and drawing
+        frame_idx = 0
         while True:
-            # Read frame
-            ret, frame = cap.read()
-            if not ret:
+            frames = capture_queue.get()
+            if frames is None:
                 break
-            
-            frame_start_time = time.time()
-            
-            # Run detection
-            detections = detector.detect(frame)
-            
-            # Update tracker
-            tracks = tracker.update(detections)
-            
-            # Update memory
-            missing_objects, new_objects = object_memory.update(tracks)
-            
-            # Visualize results
-            output_frame = visualizer.draw_results(
-                frame.copy(), 
-                tracks, 
-                missing_objects, 
-                new_objects
-            )
-            
-            # Calculate processing time for this frame
-            frame_time = time.time() - frame_start_time
-            processing_times.append(frame_time)
-            
-            # Display FPS on frame
-            current_fps = 1.0 / frame_time if frame_time > 0 else 0
-            cv2.putText(output_frame, f"FPS: {current_fps:.2f}", (10, 30), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-            
-            # Display output
-            if args.show:
-                cv2.imshow('Output', output_frame)
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
-            
-            # Write to video
-            if video_writer:
-                video_writer.write(output_frame)
-            
-            frame_count += 1
-            
+
+            batch_start_time = time.time()
+
+            if args.detect_stride > 1:
+                # Detect only every K-th frame; skipped frames carry None
+                # and are propagated by the tracker downstream
+                detect_flags = [(frame_idx + i) % args.detect_stride == 0
+                                for i in range(len(frames))]
+                to_detect = [f for f, flag in zip(frames, detect_flags) if flag]
+                detected = iter(detector.detect_batch(to_detect)) if to_detect else iter(())
+                batch_detections = [next(detected) if flag else None
+                                    for flag in detect_flags]
+            else:
+                batch_detections = detector.detect_batch(frames)
+            frame_idx += len(frames)
+
+            # Amortize the batch inference time over its frames
+            detect_time_per_frame = (time.time() - batch_start_time) / len(frames)
+
+            result_queue.put((frames, batch_detections, detect_time_per_frame))
+
+            # Display on the main thread, draining whatever finished while
+            # this batch ran
+            if display_queue is not None:
+                try:
+                    while True:
+                        cv2.imshow('Output', display_queue.get_nowait())
+                        if cv2.waitKey(1) & 0xFF == ord('q'):
+                            stop_event.set()
+                except queue.Empty:
+                    pass
+
     except KeyboardInterrupt:
         print("Processing interrupted by user")
+        stop_event.set()
     finally:
+        # Unblock and drain the capture stage, then stop the pipeline
+        stop_event.set()
+        while True:
+            try:
+                if capture_queue.get_nowait() is None:
+                    break
+            except queue.Empty:
+                break
+        result_queue.put(None)
+        capture_thread.join(timeout=5.0)
+        postprocess_thread.join(timeout=10.0)
+
         # Clean up
         if cap:
             cap.release()
@@ -1,86 +1,198 @@
 import cv2
+import numpy as np
 import threading
-import queue
-import time
+from collections import deque
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+
+class FramePool:
+    """LIFO pool of preallocated frame buffers for the capture path.
+
+    Buffers are page-locked (pinned) host memory when CUDA is available, so
+    uploads to the GPU can run asynchronously at full PCIe bandwidth; reads
+    decode straight into a recycled buffer instead of a fresh allocation.
+    """
+
+    def __init__(self, width, height, size=4, pinned=False):
+        """
+        Initialize frame pool.
+
+        Args:
+            width: Frame width
+            height: Frame height
+            size: Number of preallocated buffers
+            pinned: Allocate page-locked memory (requires torch + CUDA)
+        """
+        self.width = width
+        self.height = height
+        self.pinned = pinned and torch is not None and torch.cuda.is_available()
+        self._tensors = []  # Keeps pinned tensors alive; buffers are numpy views
+        self._free = [self._allocate() for _ in range(size)]
+
+    def _allocate(self):
+        """Allocate a single frame buffer."""
+        if self.pinned:
+            tensor = torch.empty((self.height, self.width, 3), dtype=torch.uint8,
+                                 pin_memory=True)
+            self._tensors.append(tensor)
+            return tensor.numpy()
+        return np.empty((self.height, self.width, 3), dtype=np.uint8)
+
+    def acquire(self):
+        """Get a free buffer, allocating a new one if the pool is exhausted."""
+        if self._free:
+            return self._free.pop()
+        return self._allocate()
+
+    def release(self, buffer):
+        """Return a buffer to the pool for reuse."""
+        self._free.append(buffer)
 
 
 class VideoWriter:
     """Threaded video writer for better performance."""
     
-    def __init__(self, output_path, fps, frame_size, queue_size=128):
+    def __init__(self, output_path, fps, frame_size, slots=8, use_nvenc=True):
         """
         Initialize video writer.
-        
+
         Args:
             output_path: Path to output video file
             fps: Frames per second
             frame_size: Frame size (width, height)
-            queue_size: Size of the frame queue
+            slots: Number of preallocated frame slots in the ring
+            use_nvenc: Try the hardware NVENC encoder before software mp4v
         """
         self.output_path = output_path
         self.fps = fps
         self.frame_size = frame_size
-        self.queue = queue.Queue(maxsize=queue_size)
+        self.use_nvenc = use_nvenc
+
+        # Fixed ring of preallocated frame slots: producers render/copy into
+        # a free slot and commit just its index, so the writer thread never
+        # allocates and no frame references cross the thread boundary
+        width, height = frame_size
+        self.buffers = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(slots)]
+        self.free_slots = deque(range(slots))
+        self.committed = deque()
+        self.condition = threading.Condition()
+
         self.stop_event = threading.Event()
         self.writer = None
-        
+
         # Start writer thread
         self.thread = threading.Thread(target=self._writer_thread, daemon=True)
         self.thread.start()
-        
-    def _writer_thread(self):
-        """Writer thread function."""
-        # Initialize writer
+
+    def _open_writer(self):
+        """Open the encoder, preferring hardware NVENC over software mp4v.
+
+        NVENC runs on the GPU's dedicated encode block, so 1080p encoding
+        costs no CPU cycles and no CUDA compute.
+        """
+        if self.use_nvenc:
+            pipeline = (
+                "appsrc ! videoconvert ! nvh264enc ! h264parse ! mp4mux ! "
+                f"filesink location={self.output_path}"
+            )
+            writer = cv2.VideoWriter(pipeline, cv2.CAP_GSTREAMER, 0,
+                                     self.fps, self.frame_size)
+            if writer.isOpened():
+                return writer
+            print("NVENC GStreamer pipeline unavailable, falling back to mp4v")
+
         fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        self.writer = cv2.VideoWriter(
-            self.output_path, 
-            fourcc, 
-            self.fps, 
+        return cv2.VideoWriter(
+            self.output_path,
+            fourcc,
+            self.fps,
             self.frame_size
         )
-        
-        while not self.stop_event.is_set():
-            try:
-                # Get frame with timeout
-                frame = self.queue.get(timeout=1.0)
-                if frame is None:
+
+    def _writer_thread(self):
+        """Writer thread function: drains committed slots into the encoder."""
+        # Initialize writer
+        self.writer = self._open_writer()
+
+        while True:
+            with self.condition:
+                while not self.committed and not self.stop_event.is_set():
+                    self.condition.wait(timeout=1.0)
+                if self.committed:
+                    slot = self.committed.popleft()
+                elif self.stop_event.is_set():
                     break
-                    
-                # Write frame
-                self.writer.write(frame)
-                self.queue.task_done()
-            except queue.Empty:
-                continue
-                
+                else:
+                    continue
+
+            # Encode outside the lock, then recycle the slot
+            self.writer.write(self.buffers[slot])
+            with self.condition:
+                self.free_slots.append(slot)
+
         # Release writer
         if self.writer:
             self.writer.release()
-            
+
+    def acquire(self):
+        """
+        Reserve a free frame slot to render into.
+
+        Returns:
+            Tuple of (slot index, buffer) or None if all slots are in use
+        """
+        with self.condition:
+            if not self.free_slots:
+                return None
+            slot = self.free_slots.popleft()
+        return slot, self.buffers[slot]
+
+    def commit(self, slot):
+        """
+        Hand a filled slot to the writer thread.
+
+        Args:
+            slot: Slot index returned by acquire()
+        """
+        with self.condition:
+            self.committed.append(slot)
+            self.condition.notify()
+
     def write(self, frame):
         """
-        Write frame to video.
-        
+        Write frame to video by copying it into a free slot.
+
+        The copy is explicit and bounded: after this returns, the caller
+        may reuse its frame buffer immediately.
+
         Args:
             frame: Frame to write
         """
-        try:
-            self.queue.put(frame, block=False)
-        except queue.Full:
-            # Skip frame if queue is full
-            pass
-            
+        acquired = self.acquire()
+        if acquired is None:
+            # Skip frame if all slots are in use
+            return
+        slot, buffer = acquired
+        np.copyto(buffer, frame)
+        self.commit(slot)
+
     def release(self):
         """Release resources."""
-        # Signal thread to stop
-        self.stop_event.set()
-        
-        # Wait for queue to empty
-        remaining = self.queue.qsize()
+        # Signal thread to stop after draining committed slots
+        with self.condition:
+            remaining = len(self.committed)
+            self.stop_event.set()
+            self.condition.notify()
+
         if remaining > 0:
             print(f"Waiting for {remaining} frames to be written...")
-            
+
         # Wait for thread to finish
         self.thread.join(timeout=10.0)
-        
+
         if self.thread.is_alive():
             print("Warning: Video writer thread did not terminate properly")
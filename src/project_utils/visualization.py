@@ -1,16 +1,26 @@
 import cv2
 import numpy as np
-import random
 
 
 class Visualizer:
     """Class for visualization of detection results."""
-    
+
     def __init__(self):
         """Initialize visualizer."""
-        self.colors = {}  # track_id -> color
+        # Fixed 256-entry color table: colors are resolved with a single
+        # index per draw instead of per-track RNG calls and dict bookkeeping
+        rng = np.random.default_rng(42)
+        self.color_lut = [tuple(int(c) for c in color)
+                          for color in rng.integers(0, 256, size=(256, 3))]
         self.base_font_scale = 0.5
         self.base_thickness = 2
+        self._status_overlay = None  # Reused black buffer for the status-box blend
+        self._textsize_cache = {}  # label -> (width, height), labels repeat across frames
+        self._textsize_cache_max = 1024  # Cleared at the cap; labels churn with confidence
+
+    def _color_for(self, track_id):
+        """Look up the display color for a track ID."""
+        return self.color_lut[track_id & 0xFF]
         
     def draw_results(self, frame, tracks, missing_objects, new_objects):
         """
@@ -34,15 +44,21 @@ class Visualizer:
         # Draw status box
         status_height = 100
         status_width = 300
-        status_x = width - status_width - 10
+        # Clamp the box to the frame so small inputs (low-res webcams)
+        # yield a valid region instead of a wrapped or empty slice
+        status_x = max(0, width - status_width - 10)
         status_y = 10
-        
-        # Draw semi-transparent background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (status_x, status_y), 
-                     (status_x + status_width, status_y + status_height), 
-                     (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
+        status_x2 = min(width, status_x + status_width)
+        status_y2 = min(height, status_y + status_height)
+
+        # Draw semi-transparent background by blending only the status-box
+        # region against a reused black overlay; the rest of the frame is
+        # never read or written
+        roi = frame[status_y:status_y2, status_x:status_x2]
+        if roi.size:
+            if self._status_overlay is None or self._status_overlay.shape != roi.shape:
+                self._status_overlay = np.zeros_like(roi)
+            cv2.addWeighted(self._status_overlay, 0.6, roi, 0.4, 0, dst=roi)
         
         # Draw status info
         font = cv2.FONT_HERSHEY_SIMPLEX
@@ -69,45 +85,49 @@ class Visualizer:
     
     def _draw_track(self, frame, track):
         """Draw track on frame."""
-        # Generate color for track if not exists
-        if track.track_id not in self.colors:
-            self.colors[track.track_id] = self._generate_color()
-            
-        color = self.colors[track.track_id]
-        
-        # Draw bounding box
-        x1, y1, x2, y2 = [int(v) for v in track.bbox]
-        cv2.rectangle(frame, (x1, y1), (x2, y2), color, self.base_thickness)
-        
+        # Local bindings skip repeated attribute lookups in the hot loop
+        rectangle, put_text, font = cv2.rectangle, cv2.putText, cv2.FONT_HERSHEY_SIMPLEX
+
+        color = self._color_for(track.track_id)
+
+        # Draw bounding box (single vectorized int conversion)
+        x1, y1, x2, y2 = track.bbox.astype(np.int32)
+        rectangle(frame, (x1, y1), (x2, y2), color, self.base_thickness)
+
         # Draw track ID and class
         label = f"{track.track_id}: {track.class_name} ({track.confidence:.2f})"
-        
-        # Draw background for text
-        (text_width, text_height), _ = cv2.getTextSize(
-            label, cv2.FONT_HERSHEY_SIMPLEX, self.base_font_scale, 1)
-        cv2.rectangle(frame, (x1, y1 - text_height - 4), 
-                     (x1 + text_width, y1), color, -1)
-        
+
+        # Draw background for text; sizes are memoized since labels repeat
+        # across frames for any stationary object
+        text_size = self._textsize_cache.get(label)
+        if text_size is None:
+            text_size = cv2.getTextSize(label, font, self.base_font_scale, 1)[0]
+            # Labels embed the confidence, so distinct keys accumulate on a
+            # long stream; reset at the cap rather than grow without bound
+            if len(self._textsize_cache) >= self._textsize_cache_max:
+                self._textsize_cache.clear()
+            self._textsize_cache[label] = text_size
+        text_width, text_height = text_size
+        rectangle(frame, (x1, y1 - text_height - 4),
+                  (x1 + text_width, y1), color, -1)
+
         # Draw text
-        cv2.putText(frame, label, (x1, y1 - 5), 
-                   cv2.FONT_HERSHEY_SIMPLEX, self.base_font_scale, 
-                   (255, 255, 255), 1)
-        
-        # Draw trajectory
-        if len(track.trajectory) > 1:
-            points = np.array(track.trajectory, dtype=np.int32)
+        put_text(frame, label, (x1, y1 - 5),
+                 font, self.base_font_scale,
+                 (255, 255, 255), 1)
+
+        # Draw trajectory; track.trajectory is already an int32 array view
+        points = track.trajectory
+        if len(points) > 1:
             cv2.polylines(frame, [points], False, color, 2)
         
     def _draw_missing_objects(self, frame, missing_objects):
         """Draw indicators for missing objects."""
         for i, obj in enumerate(missing_objects):
             # Draw last known position
-            if obj.track_id in self.colors:
-                color = self.colors[obj.track_id]
-            else:
-                color = (0, 0, 255)  # Red for missing objects
-                
-            x1, y1, x2, y2 = [int(v) for v in obj.last_bbox]
+            color = self._color_for(obj.track_id)
+
+            x1, y1, x2, y2 = np.asarray(obj.last_bbox, dtype=np.int32)
             center_x = int((x1 + x2) / 2)
             center_y = int((y1 + y2) / 2)
             
@@ -131,12 +151,9 @@ class Visualizer:
         """Draw indicators for new objects."""
         for i, obj in enumerate(new_objects):
             # Draw last known position
-            if obj.track_id in self.colors:
-                color = self.colors[obj.track_id]
-            else:
-                color = (0, 255, 0)  # Green for new objects
-                
-            x1, y1, x2, y2 = [int(v) for v in obj.last_bbox]
+            color = self._color_for(obj.track_id)
+
+            x1, y1, x2, y2 = np.asarray(obj.last_bbox, dtype=np.int32)
             
             # Draw animated rectangle (thicker)
             cv2.rectangle(frame, (x1, y1), (x2, y2), color, 3)
@@ -144,13 +161,5 @@ class Visualizer:
             # Draw "NEW" label
             label = f"NEW: {obj.class_name}"
             cv2.putText(frame, label, (x1, y1 - 10), 
-                       cv2.FONT_HERSHEY_SIMPLEX, self.base_font_scale, 
+                       cv2.FONT_HERSHEY_SIMPLEX, self.base_font_scale,
                        color, 2)
-    
-    def _generate_color(self):
-        """Generate random color for track."""
-        return (
-            random.randint(0, 255),
-            random.randint(0, 255),
-            random.randint(0, 255)
-        )
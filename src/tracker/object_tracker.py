@@ -3,18 +3,20 @@ from scipy.optimize import linear_sum_assignment
 
 
 class Track:
-    def __init__(self, detection, track_id, class_names=None):
+    def __init__(self, bbox, confidence, class_id, track_id, class_names=None):
         """
         Initialize a new track.
 
         Args:
-            detection: Detection object (dictionary)
+            bbox: Bounding box [x1, y1, x2, y2]
+            confidence: Confidence score
+            class_id: Class ID
             track_id: Unique track ID
             class_names: Optional dictionary mapping class IDs to class names
         """
-        self.bbox = detection['box']  # Bounding box [x1, y1, x2, y2]
-        self.confidence = detection['confidence']  # Confidence score
-        self.class_id = detection['class']  # Class ID
+        self.bbox = np.array(bbox, dtype=np.float32)
+        self.confidence = float(confidence)
+        self.class_id = int(class_id)
         self.track_id = track_id
         self.age = 0
         self.hits = 0
@@ -27,35 +29,69 @@ class Track:
         # Set class name if class_names mapping is provided
         self.class_name = class_names[self.class_id] if class_names and self.class_id in class_names else str(self.class_id)
 
-        # Initialize trajectory with the first centroid
-        self.trajectory = [self.centroid]
+        # Preallocated trajectory buffer, grown by doubling; drawing reads
+        # it as an int32 array view with no per-frame list conversion
+        self._trajectory = np.empty((16, 2), dtype=np.int32)
+        self._trajectory_len = 0
+        self._append_trajectory()
 
-    def update(self, detection):
+        # Constant-velocity estimate from the last two centroids, used to
+        # propagate the track on frames where detection is skipped
+        self.velocity = (0.0, 0.0)
+
+    def _append_trajectory(self):
+        """Record the current centroid in the trajectory buffer."""
+        if self._trajectory_len == len(self._trajectory):
+            self._trajectory = np.concatenate([self._trajectory, np.empty_like(self._trajectory)])
+        self._trajectory[self._trajectory_len] = self.centroid
+        self._trajectory_len += 1
+
+    @property
+    def trajectory(self):
+        """Recorded centroids as an (N, 2) int32 array view."""
+        return self._trajectory[:self._trajectory_len]
+
+    def update(self, bbox, confidence, class_id):
         """
-        Update track with new detection.
+        Update track with new detection data.
 
         Args:
-            detection: Detection object
+            bbox: Bounding box [x1, y1, x2, y2]
+            confidence: Confidence score
+            class_id: Class ID
         """
-        self.bbox = detection['box']  # Update to use dictionary key
-        self.confidence = detection['confidence']  # Update to use dictionary key
-        self.class_id = detection['class']  # Update to use dictionary key
+        self.bbox = np.array(bbox, dtype=np.float32)
+        self.confidence = float(confidence)
+        self.class_id = int(class_id)
         self.age += 1
         self.hits += 1
 
-        # Update centroid and add it to the trajectory
+        # Update centroid, velocity estimate, and trajectory
+        previous_centroid = self.centroid
         x1, y1, x2, y2 = self.bbox
         self.centroid = ((x1 + x2) / 2, (y1 + y2) / 2)
-        self.trajectory.append(self.centroid)
-        
+        self.velocity = (self.centroid[0] - previous_centroid[0],
+                         self.centroid[1] - previous_centroid[1])
+        self._append_trajectory()
+
+    def predict(self):
+        """Advance the track one frame by its estimated velocity."""
+        vx, vy = self.velocity
+        self.bbox[[0, 2]] += vx
+        self.bbox[[1, 3]] += vy
+        x1, y1, x2, y2 = self.bbox
+        self.centroid = ((x1 + x2) / 2, (y1 + y2) / 2)
+        self._append_trajectory()
+        self.age += 1
+
     def mark_missed(self):
         """Mark the track as missed in current frame."""
         self.missed += 1
-        
+
     def is_confirmed(self):
         """Check if the track is confirmed (seen multiple times)."""
         return self.hits >= 3
-        
+
     def should_be_deleted(self):
         """Check if the track should be deleted."""
         return self.missed >= 30
@@ -63,11 +99,11 @@ class Track:
 
 class SimpleTracker:
     """Simple IoU-based object tracker."""
-    
+
     def __init__(self, iou_threshold=0.3, max_age=30):
         """
         Initialize tracker.
-        
+
         Args:
             iou_threshold: IoU threshold for matching
             max_age: Maximum number of frames to keep invisible tracks
@@ -76,107 +112,157 @@ class SimpleTracker:
         self.max_age = max_age
         self.tracks = []
         self.next_track_id = 1
-        
+
     def update(self, detections):
         """
         Update tracker with new detections.
-        
+
         Args:
-            detections: List of Detection objects (dictionaries)
-            
+            detections: Detections container for the current frame
+
         Returns:
             List of Track objects
         """
+        num_detections = len(detections)
+
         # Handle first frame
         if not self.tracks:
-            for detection in detections:
-                self._init_track(detection)
+            for idx in range(num_detections):
+                self._init_track(detections, idx)
             return self.tracks
-            
+
         # Calculate IoU between tracks and new detections
-        if self.tracks and detections:
-            iou_matrix = np.zeros((len(self.tracks), len(detections)))
-            
-            for i, track in enumerate(self.tracks):
-                for j, detection in enumerate(detections):
-                    iou_matrix[i, j] = self._calculate_iou(track.bbox, detection['box'])  # Access bbox using dictionary key
-                    
-            # Apply Hungarian algorithm for optimal assignment
-            track_indices, detection_indices = linear_sum_assignment(-iou_matrix)
-            
+        if self.tracks and num_detections:
+            track_boxes = np.asarray([track.bbox for track in self.tracks], dtype=np.float32)
+            iou_matrix = self._iou_matrix(track_boxes, detections.boxes)
+
+            if iou_matrix.max() < self.iou_threshold:
+                # No plausible pair anywhere: skip assignment entirely, so
+                # every track is marked missed and every detection is new
+                track_indices = detection_indices = np.empty(0, dtype=np.intp)
+            elif min(len(self.tracks), num_detections) <= 8:
+                # Greedy IoU-descending matching beats the Hungarian solver
+                # for a handful of objects and is almost always identical
+                track_indices, detection_indices = self._greedy_assignment(iou_matrix)
+            else:
+                # Apply Hungarian algorithm for optimal assignment
+                track_indices, detection_indices = linear_sum_assignment(-iou_matrix)
+
             # Update matched tracks
             for track_idx, detection_idx in zip(track_indices, detection_indices):
                 if iou_matrix[track_idx, detection_idx] >= self.iou_threshold:
-                    self.tracks[track_idx].update(detections[detection_idx])
-                    detections[detection_idx]['track_id'] = self.tracks[track_idx].track_id
+                    self.tracks[track_idx].update(detections.boxes[detection_idx],
+                                                  detections.confidences[detection_idx],
+                                                  detections.classes[detection_idx])
+                    detections.track_ids[detection_idx] = self.tracks[track_idx].track_id
                 else:
                     # Mark track as invisible
                     self.tracks[track_idx].mark_missed()
-                    
+
             # Find unmatched detections
             matched_detection_indices = set(detection_indices[iou_matrix[track_indices, detection_indices] >= self.iou_threshold])
-            unmatched_detection_indices = [i for i in range(len(detections)) if i not in matched_detection_indices]
-            
+            unmatched_detection_indices = [i for i in range(num_detections) if i not in matched_detection_indices]
+
             # Initialize new tracks for unmatched detections
             for idx in unmatched_detection_indices:
-                self._init_track(detections[idx])
-                
+                self._init_track(detections, idx)
+
             # Mark unmatched tracks as invisible
             matched_track_indices = set(track_indices[iou_matrix[track_indices, detection_indices] >= self.iou_threshold])
             for i in range(len(self.tracks)):
                 if i not in matched_track_indices:
                     self.tracks[i].mark_missed()
-                    
+
         else:
             # If there are tracks but no detections, mark all tracks as invisible
             if self.tracks:
                 for track in self.tracks:
                     track.mark_missed()
-                    
+
             # If there are detections but no tracks, create new tracks
-            if detections:
-                for detection in detections:
-                    self._init_track(detection)
-                    
+            for idx in range(num_detections):
+                self._init_track(detections, idx)
+
         # Remove old tracks
         self.tracks = [track for track in self.tracks if not track.should_be_deleted()]
-        
+
         return self.tracks
-    
-    def _init_track(self, detection):
-        """Initialize a new track from detection."""
+
+    def predict(self):
+        """
+        Propagate all tracks one frame forward without running detection.
+
+        Used on skipped frames: each track's bbox and centroid move by the
+        constant-velocity estimate, and missed counts are left untouched.
+
+        Returns:
+            List of Track objects
+        """
+        for track in self.tracks:
+            track.predict()
+        return self.tracks
+
+    def _init_track(self, detections, idx):
+        """Initialize a new track from the detection at the given index."""
         # Example class names mapping (replace with your actual mapping if available)
         class_names = {0: "person", 1: "bicycle", 2: "car"}  # Example mapping
-        track = Track(detection, self.next_track_id, class_names=class_names)
-        detection['track_id'] = self.next_track_id  # Store track_id in the dictionary
+        track = Track(detections.boxes[idx], detections.confidences[idx],
+                      detections.classes[idx], self.next_track_id, class_names=class_names)
+        detections.track_ids[idx] = self.next_track_id
         self.next_track_id += 1
         self.tracks.append(track)
-        
-    def _calculate_iou(self, bbox1, bbox2):
+
+    def _greedy_assignment(self, iou_matrix):
+        """
+        Greedy IoU-descending assignment for small matrices.
+
+        Repeatedly takes the highest remaining IoU pair and removes its row
+        and column until no pair reaches the IoU threshold.
+
+        Args:
+            iou_matrix: (T, D) IoU matrix
+
+        Returns:
+            Tuple of (track_indices, detection_indices) arrays
+        """
+        iou = iou_matrix.copy()
+        track_indices = []
+        detection_indices = []
+
+        while True:
+            track_idx, detection_idx = np.unravel_index(np.argmax(iou), iou.shape)
+            if iou[track_idx, detection_idx] < self.iou_threshold:
+                break
+            track_indices.append(track_idx)
+            detection_indices.append(detection_idx)
+            iou[track_idx, :] = -1.0
+            iou[:, detection_idx] = -1.0
+
+        return (np.asarray(track_indices, dtype=np.intp),
+                np.asarray(detection_indices, dtype=np.intp))
+
+    def _iou_matrix(self, track_boxes, detection_boxes):
         """
-        Calculate IoU between two bounding boxes.
-        
+        Calculate all pairwise IoUs between track and detection boxes.
+
         Args:
-            bbox1: [x1, y1, x2, y2]
-            bbox2: [x1, y1, x2, y2]
-            
+            track_boxes: (T, 4) array of [x1, y1, x2, y2]
+            detection_boxes: (D, 4) array of [x1, y1, x2, y2]
+
         Returns:
-            IoU value
+            (T, D) IoU matrix
         """
-        x1 = max(bbox1[0], bbox2[0])
-        y1 = max(bbox1[1], bbox2[1])
-        x2 = min(bbox1[2], bbox2[2])
-        y2 = min(bbox1[3], bbox2[3])
-        
-        # Check if there is an intersection
-        if x2 < x1 or y2 < y1:
-            return 0.0
-            
-        intersection_area = (x2 - x1) * (y2 - y1)
-        
-        bbox1_area = (bbox1[2] - bbox1[0]) * (bbox1[3] - bbox1[1])
-        bbox2_area = (bbox2[2] - bbox2[0]) * (bbox2[3] - bbox2[1])
-        
-        union_area = bbox1_area + bbox2_area - intersection_area
-        
-        return intersection_area / union_area if union_area > 0 else 0.0
+        # Broadcasted intersection corners: (T, 1) against (1, D)
+        x1 = np.maximum(track_boxes[:, None, 0], detection_boxes[None, :, 0])
+        y1 = np.maximum(track_boxes[:, None, 1], detection_boxes[None, :, 1])
+        x2 = np.minimum(track_boxes[:, None, 2], detection_boxes[None, :, 2])
+        y2 = np.minimum(track_boxes[:, None, 3], detection_boxes[None, :, 3])
+
+        intersection_area = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+        track_areas = (track_boxes[:, 2] - track_boxes[:, 0]) * (track_boxes[:, 3] - track_boxes[:, 1])
+        detection_areas = (detection_boxes[:, 2] - detection_boxes[:, 0]) * (detection_boxes[:, 3] - detection_boxes[:, 1])
+
+        union_area = track_areas[:, None] + detection_areas[None, :] - intersection_area
+
+        return intersection_area / (union_area + 1e-9)
@@ -1,79 +1,232 @@
-import unittest
+from unittest.mock import MagicMock
+
 import cv2
-import torch
 import numpy as np
-import os
-import sys
-
-# Add src directory to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import pytest
+import torch
 
 from src.detector.detection_model import YOLODetector, Detection
 
 
-class TestDetection(unittest.TestCase):
-    """Test cases for Detection class."""
-    
-    def setUp(self):
-        """Set up test case."""
-        self.bbox = [10, 20, 30, 40]  # [x1, y1, x2, y2]
-        self.confidence = 0.85
-        self.class_id = 0
-        self.class_name = "person"
-        self.detection = Detection(self.bbox, self.confidence, self.class_id, self.class_name)
-        
-    def test_detection_initialization(self):
-        """Test Detection initialization."""
-        self.assertEqual(self.detection.bbox, self.bbox)
-        self.assertEqual(self.detection.confidence, self.confidence)
-        self.assertEqual(self.detection.class_id, self.class_id)
-        self.assertEqual(self.detection.class_name, self.class_name)
-        self.assertIsNone(self.detection.track_id)
-        
-    def test_detection_centroid(self):
-        """Test Detection centroid calculation."""
-        expected_centroid = ((self.bbox[0] + self.bbox[2]) / 2, 
-                            (self.bbox[1] + self.bbox[3]) / 2)
-        self.assertEqual(self.detection.centroid, expected_centroid)
-
-
-class TestYOLODetector(unittest.TestCase):
-    """Test cases for YOLODetector class."""
-    
-    def setUp(self):
-        """Set up test case."""
-        # Skip tests if no GPU available and running on CI
-        if not torch.cuda.is_available() and os.environ.get('CI') == 'true':
-            self.skipTest("Skipping GPU tests on CI")
-            
-        self.device = 'cpu'  # Use CPU for testing
-        self.detector = YOLODetector(
-            model_name='yolov5s',
-            conf_threshold=0.45,
-            iou_threshold=0.45,
-            device=self.device
-        )
-        
-        # Create a simple test image (black with white rectangle)
-        self.test_image = np.zeros((416, 416, 3), dtype=np.uint8)
-        cv2.rectangle(self.test_image, (100, 100), (300, 300), (255, 255, 255), -1)
-        
-    def test_detector_initialization(self):
-        """Test YOLODetector initialization."""
-        self.assertEqual(self.detector.conf_threshold, 0.45)
-        self.assertEqual(self.detector.iou_threshold, 0.45)
-        self.assertEqual(self.detector.device, self.device)
-        self.assertIsNone(self.detector.classes)
-        
-    def test_detect_empty_image(self):
-        """Test detection on empty image."""
-        # Create black image
-        black_image = np.zeros((416, 416, 3), dtype=np.uint8)
-        
-        # Should not detect anything in a black image
-        detections = self.detector.detect(black_image)
-        self.assertEqual(len(detections), 0)
-        
-
-if __name__ == '__main__':
-    unittest.main()
+BBOX = [10, 20, 30, 40]  # [x1, y1, x2, y2]
+
+
+def test_detection_initialization():
+    """Test Detection initialization."""
+    detection = Detection(BBOX, 0.85, 0, "person")
+
+    assert np.array_equal(detection.bbox, BBOX)
+    assert detection.bbox.dtype == np.float32
+    assert detection.confidence == 0.85
+    assert detection.class_id == 0
+    assert detection.class_name == "person"
+    assert detection.track_id is None
+
+
+def test_detection_centroid():
+    """Test Detection centroid calculation."""
+    detection = Detection(BBOX, 0.85, 0, "person")
+    expected_centroid = ((BBOX[0] + BBOX[2]) / 2, (BBOX[1] + BBOX[3]) / 2)
+
+    assert detection.centroid == expected_centroid
+
+
+def test_detection_centroids_vectorized():
+    """Test vectorized centroid computation against the scalar path."""
+    rng = np.random.default_rng(0)
+    corners = rng.uniform(0, 640, size=(100, 2)).astype(np.float32)
+    sizes = rng.uniform(1, 100, size=(100, 2)).astype(np.float32)
+    detections = [Detection([x1, y1, x1 + w, y1 + h], 0.9, 0)
+                  for (x1, y1), (w, h) in zip(corners, sizes)]
+
+    centroids = Detection.centroids_of(detections)
+
+    assert centroids.shape == (100, 2)
+    for detection, centroid in zip(detections, centroids):
+        np.testing.assert_allclose(centroid, detection.centroid, rtol=1e-5)
+
+
+def test_detector_initialization(detector):
+    """Test YOLODetector initialization."""
+    assert detector.conf_threshold == 0.45
+    assert detector.iou_threshold == 0.45
+    assert detector.device == 'cpu'
+    assert detector.classes is None
+    assert hasattr(detector, '_input_buffers')
+
+
+def test_detect_empty_image(detector):
+    """Test detection on empty image."""
+    black_image = np.zeros((320, 320, 3), dtype=np.uint8)
+
+    # Should not detect anything in a black image
+    detections = detector.detect(black_image)
+    assert len(detections) == 0
+
+    # The all-zero short-circuit must not touch the model at all
+    original_model = detector.model
+    try:
+        detector.model = MagicMock()
+        detector.detect(black_image)
+        detector.model.assert_not_called()
+    finally:
+        detector.model = original_model
+
+
+@pytest.mark.parametrize('batch_size', [1, 4, 16])
+def test_detect_batch_empty_images(detector, batch_size):
+    """Test batched detection on lists of empty images of varying size."""
+    black_image = np.zeros((320, 320, 3), dtype=np.uint8)
+
+    results = detector.detect_batch([black_image] * batch_size)
+
+    assert len(results) == batch_size
+    for detections in results:
+        assert len(detections) == 0
+
+
+def test_postprocess_synthetic_predictions(detector):
+    """Test _postprocess on synthetic raw predictions through the NMS path."""
+    num_classes = 80
+    predictions = torch.zeros((4, 5 + num_classes))
+    # Two heavily overlapping boxes of class 0; NMS must keep the stronger
+    predictions[0, :5] = torch.tensor([100.0, 100.0, 50.0, 50.0, 0.9])
+    predictions[0, 5] = 0.95
+    predictions[1, :5] = torch.tensor([102.0, 102.0, 50.0, 50.0, 0.8])
+    predictions[1, 5] = 0.9
+    # A well-separated box of class 2 survives per-class NMS
+    predictions[2, :5] = torch.tensor([300.0, 300.0, 40.0, 40.0, 0.85])
+    predictions[2, 7] = 0.9
+    # Below the confidence threshold; filtered before NMS
+    predictions[3, :5] = torch.tensor([200.0, 200.0, 30.0, 30.0, 0.2])
+    predictions[3, 5] = 0.9
+
+    boxes, confidences, class_ids = detector._postprocess(predictions)
+
+    assert len(boxes) == 2
+    assert set(class_ids.tolist()) == {0, 2}
+    # xywh -> xyxy conversion of the kept class-0 box
+    np.testing.assert_allclose(boxes[class_ids == 0][0],
+                               [75.0, 75.0, 125.0, 125.0])
+
+
+def test_detect_empty_image_int8():
+    """Test that the quantized CPU detector matches FP32 on an empty image."""
+    quantized = YOLODetector(
+        model_name='yolov5s',
+        conf_threshold=0.45,
+        iou_threshold=0.45,
+        device='cpu',
+        imgsz=320,
+        quantize=True
+    )
+    black_image = np.zeros((320, 320, 3), dtype=np.uint8)
+
+    # Go through detect_batch so the quantized forward actually runs
+    # instead of the all-zero short-circuit
+    detections = quantized.detect_batch([black_image])[0]
+    assert len(detections) == 0
+
+
+def test_detect_with_jit_trace(test_image):
+    """Test that a jit=True detector runs detect() end to end."""
+    jit_detector = YOLODetector(
+        model_name='yolov5s',
+        conf_threshold=0.45,
+        iou_threshold=0.45,
+        device='cpu',
+        imgsz=320,
+        jit=True
+    )
+
+    detections = jit_detector.detect(test_image)
+
+    assert detections.boxes.shape[1] == 4
+
+
+def test_detect_stream_empty_frames(detector):
+    """Test streaming detection over a sequence of empty frames."""
+    black_image = np.zeros((320, 320, 3), dtype=np.uint8)
+
+    results = list(detector.detect_stream(iter([black_image] * 16)))
+
+    assert len(results) == 16
+    for detections in results:
+        assert len(detections) == 0
+
+
+def test_model_channels_last_weights(detector):
+    """Test that conv weights are stored in channels_last layout."""
+    conv_params = [p for p in detector.model.parameters() if p.dim() == 4]
+    assert conv_params
+    assert any(p.is_contiguous(memory_format=torch.channels_last)
+               for p in conv_params)
+
+
+def test_detect_runs_in_inference_mode(detector, test_image):
+    """Test that the forward pass runs under torch.inference_mode()."""
+    recorded = []
+    original_model = detector.model
+    original_backend = detector.backend
+
+    def recording_model(*args, **kwargs):
+        recorded.append(torch.is_inference_mode_enabled())
+        return original_model(*args, **kwargs)
+
+    # Force the eager path: with onnxruntime or OpenVINO installed the
+    # fixture's detector auto-activates a backend and detect() would
+    # never call the patched model
+    detector.model = recording_model
+    detector.backend = None
+    try:
+        detections = detector.detect(test_image)
+    finally:
+        detector.model = original_model
+        detector.backend = original_backend
+
+    assert recorded and all(recorded)
+    # Results are plain NumPy arrays with no autograd state attached
+    assert isinstance(detections.boxes, np.ndarray)
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="Requires CUDA")
+def test_cuda_graph_replay(test_image):
+    """Test that repeated CUDA Graph replays give identical detections."""
+    gpu_detector = YOLODetector(
+        model_name='yolov5s',
+        conf_threshold=0.45,
+        iou_threshold=0.45,
+        device='cuda:0'
+    )
+    if gpu_detector.cuda_graph is None:
+        pytest.skip("CUDA Graph capture unavailable")
+
+    first = gpu_detector.detect(test_image)
+    second = gpu_detector.detect(test_image)
+
+    assert np.array_equal(first.boxes, second.boxes)
+    assert np.array_equal(first.classes, second.classes)
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="Requires CUDA")
+def test_detect_autocast_parity(test_image):
+    """Test that autocast inference matches FP32 results on GPU."""
+    gpu_detector = YOLODetector(
+        model_name='yolov5s',
+        conf_threshold=0.45,
+        iou_threshold=0.45,
+        device='cuda:0'
+    )
+    # Force the eager PyTorch path: graph replay and engine backends
+    # never consult use_autocast, so the toggle would compare a replay
+    # against an identical replay
+    gpu_detector.cuda_graph = None
+    gpu_detector.backend = None
+
+    fp16_detections = gpu_detector.detect(test_image)
+
+    gpu_detector.use_autocast = False
+    fp32_detections = gpu_detector.detect(test_image)
+
+    # FP16 should find the same objects as FP32 on a simple scene
+    assert len(fp16_detections) == len(fp32_detections)